@@ -4,7 +4,27 @@ TI-84 Style Bond Pricing Calculator
 Implements all bond pricing formulas with calculator-style menu interface
 """
 
+import collections
+import functools
 import math
+import re
+import threading
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; pure-Python fallbacks are used
+    np = None
+
+try:
+    import numba
+except ImportError:  # Numba is optional; kernels run as plain Python
+    numba = None
+
+try:
+    # AOT-compiled kernel, built via `python setup.py build_ext --inplace`
+    from bondmath_core import _bond_core as _compiled_bond_core
+except ImportError:
+    _compiled_bond_core = None
 
 def clear_screen():
     """Clear screen for clean display"""
@@ -14,35 +34,142 @@ def pause():
     """Pause for user to read results"""
     input("\nPress ENTER to continue...")
 
+# Precompiled row formatter for table output; binding .format once skips
+# re-parsing the format spec on every printed row
+_SCENARIO_ROW = "{:7.3f}%  ${:.2f}".format
+
+# Pre-validate numeric input so the common path never raises ValueError
+_FLOAT_RE = re.compile(r'^[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?$')
+_INT_RE = re.compile(r'^[+-]?\d+$')
+
 def get_float_input(prompt, min_val=None, max_val=None):
     """Get validated float input"""
     while True:
-        try:
-            value = float(input(prompt))
-            if min_val is not None and value < min_val:
-                print(f"Value must be >= {min_val}")
-                continue
-            if max_val is not None and value > max_val:
-                print(f"Value must be <= {max_val}")
-                continue
-            return value
-        except ValueError:
+        text = input(prompt).strip()
+        if not _FLOAT_RE.match(text):
             print("Invalid input. Enter a number.")
+            continue
+        value = float(text)
+        if min_val is not None and value < min_val:
+            print(f"Value must be >= {min_val}")
+            continue
+        if max_val is not None and value > max_val:
+            print(f"Value must be <= {max_val}")
+            continue
+        return value
 
 def get_int_input(prompt, min_val=None, max_val=None):
     """Get validated integer input"""
     while True:
-        try:
-            value = int(input(prompt))
-            if min_val is not None and value < min_val:
-                print(f"Value must be >= {min_val}")
-                continue
-            if max_val is not None and value > max_val:
-                print(f"Value must be <= {max_val}")
-                continue
-            return value
-        except ValueError:
+        text = input(prompt).strip()
+        if not _INT_RE.match(text):
             print("Invalid input. Enter an integer.")
+            continue
+        value = int(text)
+        if min_val is not None and value < min_val:
+            print(f"Value must be >= {min_val}")
+            continue
+        if max_val is not None and value > max_val:
+            print(f"Value must be <= {max_val}")
+            continue
+        return value
+
+BondParams = collections.namedtuple(
+    "BondParams",
+    ["C", "F", "y", "N", "m", "total_periods", "coupon_per_period",
+     "yield_per_period"])
+
+def _prompt_bond_params():
+    """Prompt for the shared bond inputs and derive the per-period values"""
+    C = get_float_input("Annual Coupon ($): ")
+    F = get_float_input("Face Value ($): ")
+    y = get_float_input("Annual Yield to Maturity (%): ") / 100
+    N = get_float_input("Years to Maturity: ", min_val=0)
+    m = get_int_input("Payments per year (1=annual, 2=semi): ", min_val=1, max_val=12)
+    return BondParams(C, F, y, N, m, int(N * m), C / m, y / m)
+
+def _bond_core(coupon_per_period, F, yield_per_period, total_periods, m):
+    """Fused numeric kernel: bond price, Macaulay duration (years) and
+    convexity accumulated in a single pass over the payment periods"""
+    if total_periods == 0:
+        return F, 0.0, 0.0
+    price = 0.0
+    weighted_cf = 0.0
+    convexity_sum = 0.0
+    one_plus_r = 1.0 + yield_per_period
+    inv = 1.0 / one_plus_r
+    disc = 1.0  # Running (1+y)^-t, one multiply per period instead of pow
+    for t in range(1, total_periods):
+        disc *= inv
+        pv_cf = coupon_per_period * disc
+        price += pv_cf
+        weighted_cf += (t / m) * pv_cf  # Convert period to years
+        convexity_sum += coupon_per_period * t * (t + 1) * disc
+    # Final payment (coupon plus principal) added once outside the loop
+    disc *= inv
+    n = total_periods
+    cash_flow = coupon_per_period + F
+    pv_cf = cash_flow * disc
+    price += pv_cf
+    weighted_cf += (n / m) * pv_cf
+    convexity_sum += cash_flow * n * (n + 1) * disc
+    mac_duration = weighted_cf / price
+    convexity = convexity_sum / (price * one_plus_r * one_plus_r)
+    return price, mac_duration, convexity
+
+if _compiled_bond_core is not None:
+    # Prefer the AOT build: native speed with no first-call JIT stall
+    _bond_core = _compiled_bond_core
+elif numba is not None:
+    _bond_core = numba.njit(cache=True)(_bond_core)
+
+@functools.lru_cache(maxsize=16)
+def _bond_metrics(params):
+    """Price, Macaulay/modified duration and convexity for one BondParams,
+    computed in a single kernel pass and cached so re-selecting a metric
+    menu for the same bond does no arithmetic at all"""
+    price, mac_duration, convexity = _bond_core(
+        params.coupon_per_period, params.F, params.yield_per_period,
+        params.total_periods, params.m)
+    mod_duration = mac_duration / (1 + params.yield_per_period)
+    return price, mac_duration, mod_duration, convexity
+
+@functools.lru_cache(maxsize=64)
+def _discount_factors(yield_per_period, total_periods):
+    """Discount factors (1+y)^-t for t = 1..n, cached so repeat runs with
+    the same yield and maturity skip the exponentiation entirely"""
+    if np is not None:
+        d = (1.0 + yield_per_period)**-np.arange(1, total_periods + 1)
+        d.setflags(write=False)  # Cached array must stay immutable
+        return d
+    inv = 1.0 / (1 + yield_per_period)
+    disc = 1.0
+    factors = []
+    for _ in range(total_periods):
+        disc *= inv
+        factors.append(disc)
+    return tuple(factors)
+
+def bond_prices_vectorized(C, F, ys, N, m):
+    """Price one bond across a sequence of annual yields, one price per yield"""
+    total_periods = int(N * m)
+    coupon_per_period = C / m
+    if np is not None and total_periods:
+        # Broadcast over the yield grid: rows are yields, columns are periods
+        t = np.arange(1, total_periods + 1)
+        disc = np.empty((len(ys), total_periods))
+        np.power((1.0 + np.asarray(ys) / m)[:, None], -t, out=disc)
+        return coupon_per_period * disc.sum(axis=1) + F * disc[:, -1]
+    prices = []
+    for y in ys:
+        d = _discount_factors(y / m, total_periods)
+        if total_periods:
+            # fsum keeps the reduction exactly rounded for long maturities
+            price = coupon_per_period * math.fsum(d) + F * d[-1]
+        else:
+            price = F
+        prices.append(price)
+    return prices
 
 def bond_price_annual():
     """Calculate bond price with annual coupon payments"""
@@ -55,11 +182,17 @@ def bond_price_annual():
     y = get_float_input("Yield to Maturity (%): ") / 100
     N = get_int_input("Years to Maturity: ", min_val=1)
     
-    # Calculate present value
-    pv_coupons = sum(C / (1 + y)**t for t in range(1, N + 1))
-    pv_principal = F / (1 + y)**N
+    # Calculate present value (closed-form annuity factor); log1p keeps the
+    # discount factor accurate for small yields
+    if abs(y) < 1e-12:
+        disc = 1.0
+        pv_coupons = C * N
+    else:
+        disc = math.exp(-N * math.log1p(y))
+        pv_coupons = C * (1 - disc) / y
+    pv_principal = F * disc
     bond_price = pv_coupons + pv_principal
-    
+
     print(f"\nRESULTS:")
     print(f"PV of Coupons: ${pv_coupons:.2f}")
     print(f"PV of Principal: ${pv_principal:.2f}")
@@ -85,10 +218,15 @@ def bond_price_semi_annual():
     coupon_per_period = C / m
     yield_per_period = y / m
     
-    # Calculate present value
-    pv_coupons = sum(coupon_per_period / (1 + yield_per_period)**t 
-                    for t in range(1, total_periods + 1))
-    pv_principal = F / (1 + yield_per_period)**total_periods
+    # Calculate present value (closed-form annuity factor); log1p keeps the
+    # discount factor accurate for small yields
+    if abs(yield_per_period) < 1e-12:
+        disc = 1.0
+        pv_coupons = coupon_per_period * total_periods
+    else:
+        disc = math.exp(-total_periods * math.log1p(yield_per_period))
+        pv_coupons = coupon_per_period * (1 - disc) / yield_per_period
+    pv_principal = F * disc
     bond_price = pv_coupons + pv_principal
     
     print(f"\nRESULTS:")
@@ -108,35 +246,9 @@ def macaulay_duration():
     print("MACAULAY DURATION")
     print("=" * 17)
     
-    C = get_float_input("Annual Coupon ($): ")
-    F = get_float_input("Face Value ($): ")
-    y = get_float_input("Annual Yield to Maturity (%): ") / 100
-    N = get_float_input("Years to Maturity: ", min_val=0)
-    payment_freq = get_int_input("Payments per year (1=annual, 2=semi): ", min_val=1, max_val=12)
-    
-    m = payment_freq
-    total_periods = int(N * m)
-    coupon_per_period = C / m
-    yield_per_period = y / m
-    
-    # Calculate bond price first
-    bond_price = sum(coupon_per_period / (1 + yield_per_period)**t 
-                    for t in range(1, total_periods + 1))
-    bond_price += F / (1 + yield_per_period)**total_periods
-    
-    # Calculate weighted cash flows
-    weighted_cf = 0
-    for t in range(1, total_periods + 1):
-        if t == total_periods:
-            cash_flow = coupon_per_period + F  # Final payment includes principal
-        else:
-            cash_flow = coupon_per_period
-        
-        pv_cf = cash_flow / (1 + yield_per_period)**t
-        weighted_cf += (t / m) * pv_cf  # Convert period to years
-    
-    mac_duration = weighted_cf / bond_price
-    
+    p = _prompt_bond_params()
+    bond_price, mac_duration, _, _ = _bond_metrics(p)
+
     print(f"\nRESULTS:")
     print(f"Bond Price: ${bond_price:.2f}")
     print(f"Macaulay Duration: {mac_duration:.4f} years")
@@ -156,42 +268,14 @@ def modified_duration():
     
     if choice == 1:
         # Calculate Macaulay Duration first, then Modified
-        C = get_float_input("Annual Coupon ($): ")
-        F = get_float_input("Face Value ($): ")
-        y = get_float_input("Annual Yield to Maturity (%): ") / 100
-        N = get_float_input("Years to Maturity: ", min_val=0)
-        payment_freq = get_int_input("Payments per year (1=annual, 2=semi): ", min_val=1, max_val=12)
-        
-        m = payment_freq
-        total_periods = int(N * m)
-        coupon_per_period = C / m
-        yield_per_period = y / m
-        
-        # Calculate bond price
-        bond_price = sum(coupon_per_period / (1 + yield_per_period)**t 
-                        for t in range(1, total_periods + 1))
-        bond_price += F / (1 + yield_per_period)**total_periods
-        
-        # Calculate Macaulay Duration
-        weighted_cf = 0
-        for t in range(1, total_periods + 1):
-            if t == total_periods:
-                cash_flow = coupon_per_period + F
-            else:
-                cash_flow = coupon_per_period
-            
-            pv_cf = cash_flow / (1 + yield_per_period)**t
-            weighted_cf += (t / m) * pv_cf
-        
-        mac_duration = weighted_cf / bond_price
-        
+        p = _prompt_bond_params()
+        bond_price, mac_duration, mod_duration, _ = _bond_metrics(p)
     else:
         mac_duration = get_float_input("Macaulay Duration: ", min_val=0)
         y = get_float_input("Annual Yield to Maturity (%): ") / 100
         m = get_int_input("Payments per year: ", min_val=1, max_val=12)
-    
-    mod_duration = mac_duration / (1 + y/m)
-    
+        mod_duration = mac_duration / (1 + y/m)
+
     print(f"\nRESULTS:")
     if choice == 1:
         print(f"Bond Price: ${bond_price:.2f}")
@@ -228,34 +312,9 @@ def analytical_convexity():
     print("ANALYTICAL CONVEXITY")
     print("=" * 20)
     
-    C = get_float_input("Annual Coupon ($): ")
-    F = get_float_input("Face Value ($): ")
-    y = get_float_input("Annual Yield to Maturity (%): ") / 100
-    N = get_float_input("Years to Maturity: ", min_val=0)
-    payment_freq = get_int_input("Payments per year (1=annual, 2=semi): ", min_val=1, max_val=12)
-    
-    m = payment_freq
-    total_periods = int(N * m)
-    coupon_per_period = C / m
-    yield_per_period = y / m
-    
-    # Calculate bond price
-    bond_price = sum(coupon_per_period / (1 + yield_per_period)**t 
-                    for t in range(1, total_periods + 1))
-    bond_price += F / (1 + yield_per_period)**total_periods
-    
-    # Calculate convexity
-    convexity_sum = 0
-    for t in range(1, total_periods + 1):
-        if t == total_periods:
-            cash_flow = coupon_per_period + F
-        else:
-            cash_flow = coupon_per_period
-        
-        convexity_sum += cash_flow * t * (t + 1) / (1 + yield_per_period)**t
-    
-    convexity = convexity_sum / (bond_price * (1 + yield_per_period)**2)
-    
+    p = _prompt_bond_params()
+    bond_price, _, _, convexity = _bond_metrics(p)
+
     print(f"\nRESULTS:")
     print(f"Bond Price: ${bond_price:.2f}")
     print(f"Convexity: {convexity:.4f}")
@@ -270,28 +329,12 @@ def approximate_convexity():
     print("=" * 21)
     
     print("Enter bond parameters:")
-    C = get_float_input("Annual Coupon ($): ")
-    F = get_float_input("Face Value ($): ")
-    y0 = get_float_input("Current Yield to Maturity (%): ") / 100
-    N = get_float_input("Years to Maturity: ", min_val=0)
-    payment_freq = get_int_input("Payments per year (1=annual, 2=semi): ", min_val=1, max_val=12)
+    p = _prompt_bond_params()
     delta_y = get_float_input("Yield change for calculation (basis points): ") / 10000
-    
-    m = payment_freq
-    total_periods = int(N * m)
-    coupon_per_period = C / m
-    
-    def calc_bond_price(y):
-        yield_per_period = y / m
-        price = sum(coupon_per_period / (1 + yield_per_period)**t 
-                   for t in range(1, total_periods + 1))
-        price += F / (1 + yield_per_period)**total_periods
-        return price
-    
-    # Calculate prices at different yields
-    P0 = calc_bond_price(y0)          # Current price
-    P_minus = calc_bond_price(y0 - delta_y)  # Price when yield decreases
-    P_plus = calc_bond_price(y0 + delta_y)   # Price when yield increases
+
+    # Calculate prices at current yield and one shock in each direction
+    P0, P_minus, P_plus = bond_prices_vectorized(
+        p.C, p.F, [p.y, p.y - delta_y, p.y + delta_y], p.N, p.m)
     
     approx_convexity = (P_minus + P_plus - 2 * P0) / (P0 * delta_y**2)
     
@@ -338,6 +381,49 @@ def duration_convexity_adjustment():
     
     pause()
 
+def yield_scenario_table():
+    """Price a bond across a grid of yields for scenario analysis"""
+    clear_screen()
+    print("YIELD SCENARIO TABLE")
+    print("=" * 20)
+
+    C = get_float_input("Annual Coupon ($): ")
+    F = get_float_input("Face Value ($): ")
+    N = get_float_input("Years to Maturity: ", min_val=0)
+    payment_freq = get_int_input("Payments per year (1=annual, 2=semi): ", min_val=1, max_val=12)
+    y_low = get_float_input("Lowest Yield (%): ") / 100
+    y_high = get_float_input("Highest Yield (%): ", min_val=y_low * 100) / 100
+    scenarios = get_int_input("Number of scenarios: ", min_val=2, max_val=100)
+
+    step = (y_high - y_low) / (scenarios - 1)
+    ys = [y_low + i * step for i in range(scenarios)]
+    prices = bond_prices_vectorized(C, F, ys, N, payment_freq)
+
+    print(f"\nRESULTS:")
+    print("  Yield      Price")
+    print("-" * 20)
+    for y, price in zip(ys, prices):
+        print(_SCENARIO_ROW(y * 100, price))
+
+    pause()
+
+def all_metrics():
+    """Calculate price, durations and convexity in one fused pass"""
+    clear_screen()
+    print("ALL METRICS")
+    print("=" * 11)
+
+    p = _prompt_bond_params()
+    bond_price, mac_duration, mod_duration, convexity = _bond_metrics(p)
+
+    print(f"\nRESULTS:")
+    print(f"Bond Price: ${bond_price:.2f}")
+    print(f"Macaulay Duration: {mac_duration:.4f} years")
+    print(f"Modified Duration: {mod_duration:.4f}")
+    print(f"Convexity: {convexity:.4f}")
+
+    pause()
+
 def main_menu():
     """Main calculator menu"""
     while True:
@@ -352,10 +438,12 @@ def main_menu():
         print("6. Analytical Convexity")
         print("7. Approximate Convexity")
         print("8. Duration + Convexity")
-        print("9. Exit")
+        print("9. Yield Scenario Table")
+        print("10. All Metrics")
+        print("11. Exit")
         print("=" * 21)
-        
-        choice = get_int_input("Select option (1-9): ", min_val=1, max_val=9)
+
+        choice = get_int_input("Select option (1-11): ", min_val=1, max_val=11)
         
         if choice == 1:
             bond_price_annual()
@@ -374,9 +462,21 @@ def main_menu():
         elif choice == 8:
             duration_convexity_adjustment()
         elif choice == 9:
+            yield_scenario_table()
+        elif choice == 10:
+            all_metrics()
+        elif choice == 11:
             clear_screen()
             print("Thank you for using TI-84 Bond Calculator!")
             break
 
+def _warm_up():
+    """Run the kernel once with dummy arguments to trigger its JIT compile"""
+    _bond_core(100.0, 1000.0, 0.05, 10, 2)
+
 if __name__ == "__main__":
+    if numba is not None and _compiled_bond_core is None:
+        # Compile the Numba kernel in the background so the first menu
+        # calculation never waits on it; cache=True covers later launches
+        threading.Thread(target=_warm_up, daemon=True).start()
     main_menu()
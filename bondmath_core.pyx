@@ -0,0 +1,40 @@
+# cython: language_level=3
+"""
+AOT-compiled bond kernel
+Optional drop-in replacement for the pure-Python _bond_core in bondmath.py;
+build with `python setup.py build_ext --inplace`
+"""
+
+cimport cython
+
+@cython.cdivision(True)
+def _bond_core(double coupon_per_period, double F, double yield_per_period,
+               int total_periods, int m):
+    """Fused numeric kernel: bond price, Macaulay duration (years) and
+    convexity accumulated in a single pass over the payment periods"""
+    cdef double price = 0.0
+    cdef double weighted_cf = 0.0
+    cdef double convexity_sum = 0.0
+    cdef double one_plus_r, inv, disc, pv_cf, cash_flow
+    cdef int t, n
+    if total_periods == 0:
+        return F, 0.0, 0.0
+    one_plus_r = 1.0 + yield_per_period
+    inv = 1.0 / one_plus_r
+    disc = 1.0  # Running (1+y)^-t, one multiply per period instead of pow
+    for t in range(1, total_periods):
+        disc *= inv
+        pv_cf = coupon_per_period * disc
+        price += pv_cf
+        weighted_cf += (<double>t / m) * pv_cf  # Convert period to years
+        convexity_sum += coupon_per_period * t * (t + 1) * disc
+    # Final payment (coupon plus principal) added once outside the loop
+    disc *= inv
+    n = total_periods
+    cash_flow = coupon_per_period + F
+    pv_cf = cash_flow * disc
+    price += pv_cf
+    weighted_cf += (<double>n / m) * pv_cf
+    convexity_sum += cash_flow * n * (n + 1) * disc
+    return (price, weighted_cf / price,
+            convexity_sum / (price * one_plus_r * one_plus_r))
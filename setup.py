@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+"""Build the optional Cython-compiled bond kernel:
+python setup.py build_ext --inplace"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="bondmath-core",
+    ext_modules=cythonize("bondmath_core.pyx"),
+)